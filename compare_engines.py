@@ -0,0 +1,77 @@
+"""
+Play Monte Carlo Tree Search against minimax with alpha-beta pruning under equal time budgets
+"""
+import argparse
+import itertools
+import time
+from typing import *
+
+from model import ConnectFour
+from controller import MinimaxABController, MCTSController
+from minimax import minimaxab
+
+
+def play_game(depth: int, opening: Tuple[int, ...], mcts_red: bool, batch_size: int) -> Tuple[int, float, float]:
+    """
+    Plays one game from a fixed opening, giving each MCTS move the time minimaxab takes to search the same position
+
+    :param depth: an int, the search depth of minimaxab
+    :param opening: a tuple of ints, the columns played before the engines take over
+    :param mcts_red: a bool, whether MCTS plays P1
+    :param batch_size: an int, the number of leaves MCTS plays out at once
+    :return: a tuple of 1 if MCTS won, -1 if minimaxab won, or 0 for a draw, and the average seconds per move of
+        minimaxab and of MCTS
+    """
+    board = ConnectFour()
+    for col in opening:
+        board.place_token(col)
+    minimax_player = MinimaxABController(board, not mcts_red, depth)
+    mcts_player = MCTSController(board, mcts_red, batch_size=batch_size)
+
+    minimax_time, minimax_moves = 0.0, 0
+    mcts_time, mcts_moves = 0.0, 0
+    while board.turn_count < 42 and board.check_win() == 0:
+        if board.is_red == mcts_red:
+            # Give MCTS the time minimaxab takes to search this same position. That search is not one of minimaxab's
+            # moves, so it is left out of its average
+            start = time.perf_counter()
+            minimaxab(depth, board, board.is_red)
+            mcts_player.time_limit = time.perf_counter() - start
+            start = time.perf_counter()
+            mcts_player.move()
+            mcts_time += time.perf_counter() - start
+            mcts_moves += 1
+        else:
+            start = time.perf_counter()
+            minimax_player.move()
+            minimax_time += time.perf_counter() - start
+            minimax_moves += 1
+
+    winner = board.check_win()
+    return (winner if mcts_red else -winner), minimax_time / max(minimax_moves, 1), mcts_time / max(mcts_moves, 1)
+
+
+def main():
+    """
+    Play MCTS against minimaxab from every opening of the given length, once as each color
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=4, help='search depth of minimaxab')
+    parser.add_argument('--opening-length', type=int, default=1, help='number of moves in each opening')
+    parser.add_argument('--batch-size', type=int, default=64, help='number of leaves MCTS plays out at once')
+    args = parser.parse_args()
+
+    outcomes = []
+    for opening in itertools.product(range(7), repeat=args.opening_length):
+        for mcts_red in (True, False):
+            outcome, minimax_move_time, mcts_move_time = play_game(args.depth, opening, mcts_red, args.batch_size)
+            outcomes.append(outcome)
+            print(f'Opening {opening}, MCTS as {"P1" if mcts_red else "P2"}: '
+                  f'{["draw", "MCTS won", "minimaxab won"][outcome]} (seconds per move: '
+                  f'minimaxab {minimax_move_time:.4f}, MCTS {mcts_move_time:.4f})')
+
+    print(f'MCTS: {outcomes.count(1)} wins, {outcomes.count(-1)} losses, {outcomes.count(0)} draws')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,11 @@ Module to contain all the controllers for the Connect Four game.
 from abc import ABC, abstractmethod
 from model import ConnectFour
 from minimax import minimax, minimaxab
+from mcts import Node, mcts
+from evaluation import Evaluator
+from typing import *
+import math
+import numpy as np
 
 
 class Controller(ABC):
@@ -87,25 +92,28 @@ class MinimaxController(Controller):
 
     Attributes:
         depth: an int, how many moves ahead the minimax algorithm should look
+        evaluator: the Evaluator used to score positions, or None to use the default weights
         total_calls: an int, the total number of calls
     """
-    def __init__(self, board: ConnectFour, red: bool, depth: int = 6):
+    def __init__(self, board: ConnectFour, red: bool, depth: int = 6, evaluator: Optional[Evaluator] = None):
         """
         Initializes an instance of a controller
 
         :param board: the ConnectFour board this controller operates on
         :param red: a boolean, True if P1, False if P2
         :param depth: an int that describes the maximum look depth
+        :param evaluator: the Evaluator used to score positions, or None to use the default weights
         """
         super().__init__(board, red)
         self.depth = depth
+        self.evaluator = evaluator
         self.total_calls = 0
 
     def move(self):
         """
         Performs a move using minimax
         """
-        col, calls = minimax(self.depth, self._board, self.red)
+        col, calls = minimax(self.depth, self._board, self.red, evaluator=self.evaluator)
         self.total_calls += calls
         self._board.place_token(col)
 
@@ -119,6 +127,65 @@ class MinimaxABController(MinimaxController):
         """
         Performs a move using minimax with alpha-beta pruning
         """
-        col, calls = minimaxab(self.depth, self._board, self.red)
+        col, calls = minimaxab(self.depth, self._board, self.red, evaluator=self.evaluator)
         self.total_calls += calls
         self._board.place_token(col)
+
+
+class MCTSController(Controller):
+    """
+    A Monte Carlo Tree Search controller, which keeps its search tree between moves.
+
+    Attributes:
+        time_limit: a float, the number of seconds to search each move, or None for no time limit
+        playouts: an int, the number of playouts to perform each move, or None for no playout limit
+        batch_size: an int, the number of leaves selected and played out at once
+        exploration: a float, the UCT exploration constant
+        total_calls: an int, the total number of playouts
+    """
+    def __init__(self, board: ConnectFour, red: bool, time_limit: Optional[float] = 1.0,
+                 playouts: Optional[int] = None, batch_size: int = 64, exploration: float = math.sqrt(2),
+                 seed: Optional[int] = None):
+        """
+        Initializes an instance of a controller
+
+        :param board: the ConnectFour board this controller operates on
+        :param red: a boolean, True if P1, False if P2
+        :param time_limit: a float, the number of seconds to search each move, or None for no time limit
+        :param playouts: an int, the number of playouts to perform each move, or None for no playout limit
+        :param batch_size: an int, the number of leaves selected and played out at once
+        :param exploration: a float, the UCT exploration constant
+        :param seed: an int, the seed for the rollout moves, or None for an unpredictable seed
+        :raises: ValueError if neither limit is given, either limit or the batch size is not positive
+        """
+        if time_limit is None and playouts is None:
+            raise ValueError('Expected a time limit or playout limit, received neither.')
+        if time_limit is not None and time_limit <= 0:
+            raise ValueError(f'Time limit must be positive, received {time_limit}.')
+        if playouts is not None and playouts < 1:
+            raise ValueError(f'Playout limit must be at least 1, received {playouts}.')
+        if batch_size < 1:
+            raise ValueError(f'Batch size must be at least 1, received {batch_size}.')
+        super().__init__(board, red)
+        self.time_limit = time_limit
+        self.playouts = playouts
+        self.batch_size = batch_size
+        self.exploration = exploration
+        self.total_calls = 0
+        self._rng = np.random.default_rng(seed)
+        self._root: Optional[Node] = None
+
+    def move(self):
+        """
+        Performs a move using Monte Carlo Tree Search
+        """
+        # Reuse the subtree for the current position if the opponent played a move we searched
+        root = None if self._root is None else self._root.find(self._board)
+        if root is None:
+            root = Node(self._board.copy())
+        root.parent = None
+
+        col, playouts = mcts(root, self.time_limit, self.playouts, self.batch_size, self.exploration, self._rng)
+        self.total_calls += playouts
+        self._board.place_token(col)
+        self._root = root.children[col]
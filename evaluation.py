@@ -0,0 +1,129 @@
+"""
+Module that implements the table-driven static evaluation of Connect Four boards
+"""
+
+import json
+import numpy as np
+from typing import *
+from model import ConnectFour, WIN_WINDOWS
+
+
+# Powers of three used to encode a window as a base-3 pattern index (0: empty, 1: P1, 2: P2)
+WINDOW_POWERS = 3 ** np.arange(4)
+
+# The number of distinct states a four cell window can be in
+NUM_PATTERNS = 3 ** 4
+
+# The default weights for four, three, and two tokens in an otherwise empty window. The win and three weights match
+# the old convolution evaluation, but 'two' used to count three cell windows, so scores (and play) differ from it
+DEFAULT_WEIGHTS = {'win': 100000000000, 'three': 10, 'two': 1}
+
+
+def make_pattern_table(weights: Dict[str, int]) -> np.ndarray:
+    """
+    Precomputes the score of every possible four cell window pattern
+
+    A window only scores if it holds tokens from a single player, as a window containing both can never be won.
+
+    :param weights: a dict with the keys 'win', 'three', and 'two', the score for a window containing that many
+        tokens of one player and no tokens of the other
+    :return: a length NUM_PATTERNS ndarray of ints, the score (positive for P1) of each pattern index
+    """
+    by_count = {4: weights['win'], 3: weights['three'], 2: weights['two']}
+    table = np.zeros(NUM_PATTERNS, dtype=np.int64)
+    for index in range(NUM_PATTERNS):
+        cells = (index // WINDOW_POWERS) % 3
+        p1_count = np.sum(cells == 1)
+        p2_count = np.sum(cells == 2)
+        if p2_count == 0:
+            table[index] = by_count.get(p1_count, 0)
+        elif p1_count == 0:
+            table[index] = -by_count.get(p2_count, 0)
+    return table
+
+
+def pattern_indices(board: np.ndarray) -> np.ndarray:
+    """
+    Finds the pattern index of every winning window on one or more boards
+
+    :param board: a 6x7 ndarray of 0, 1, and -1, or a stack of them with any number of leading dimensions
+    :return: an ndarray of ints with the leading dimensions of board and a last dimension of 69, the pattern index
+        of each window in WIN_WINDOWS
+    """
+    flat = board.reshape(board.shape[:-2] + (-1,))
+    # -1 % 3 == 2, so P2 tokens map onto the third digit value
+    return (flat[..., WIN_WINDOWS] % 3) @ WINDOW_POWERS
+
+
+class Evaluator:
+    """
+    A static evaluator that scores boards by looking up each window in a precomputed pattern table
+
+    Attributes:
+        weights: a dict of strings to ints, the weights used to build the table
+        table: a length NUM_PATTERNS ndarray of ints, the score of each window pattern
+    """
+    def __init__(self, weights: Optional[Dict[str, int]] = None):
+        """
+        Initializes an evaluator
+
+        :param weights: a dict overriding any of the keys in DEFAULT_WEIGHTS, or None to use the defaults
+        :raises: ValueError if weights contains an unknown key
+        """
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights is not None:
+            unknown = set(weights) - set(DEFAULT_WEIGHTS)
+            if unknown:
+                raise ValueError(f'Unknown weights {sorted(unknown)}. Expected some of {sorted(DEFAULT_WEIGHTS)}.')
+            self.weights.update({key: int(value) for key, value in weights.items()})
+        self.table = make_pattern_table(self.weights)
+
+    @classmethod
+    def from_file(cls, filepath: str) -> 'Evaluator':
+        """
+        Loads an evaluator from a JSON file of weights
+
+        :param filepath: a string, the path to a JSON object mapping weight names to values
+        :return: an Evaluator using the weights in the file
+        """
+        with open(filepath, 'r') as file:
+            return cls(json.load(file))
+
+    def config(self) -> Dict[str, Any]:
+        """
+        :return: a dict describing this evaluator, used to tell apart results recorded with different evaluations
+        """
+        return {'evaluation': 'window-table', **self.weights}
+
+    def save(self, filepath: str):
+        """
+        Saves the weights of this evaluator to a JSON file
+
+        :param filepath: a string, the path to write the weights to
+        """
+        with open(filepath, 'w') as file:
+            json.dump(self.weights, file)
+
+    def __call__(self, gamestate: ConnectFour) -> int:
+        """
+        Calculates a score for the given game state
+
+        :param gamestate: an instance of ConnectFour to evaluate
+        :return: an int, the score for the state (positive favors P1)
+        """
+        return int(self.table[pattern_indices(gamestate.board)].sum())
+
+
+# The evaluator used when no other is given
+DEFAULT_EVALUATOR = Evaluator()
+
+
+def static_eval(gamestate: ConnectFour, evaluator: Optional[Evaluator] = None) -> int:
+    """
+    Calculates a score for the current game state
+
+    :param gamestate: an instance of ConnectFour to evaluate
+    :param evaluator: the Evaluator to score with, or None to use DEFAULT_EVALUATOR
+    :return: an int, the score for the state
+    """
+    return (DEFAULT_EVALUATOR if evaluator is None else evaluator)(gamestate)
@@ -1,21 +1,19 @@
 """
 Run the algorithm against itself and graph speed results
 """
-import os
-
 from model import ConnectFour
 from controller import MinimaxController, MinimaxABController
-import json
+from evaluation import DEFAULT_EVALUATOR
+from results_store import ResultsStore, new_run_id
 
 
 def main():
-    folder = '\\'.join(__file__.split('\\')[:-1])
-    filepath = '\\'.join((folder, 'game_results.json'))
-    with open(filepath, 'r') as file:
-        results = json.load(file)
+    store = ResultsStore()
+    run = new_run_id()
+    # Both engines search with the default evaluation, so record it to tell these results apart from other evaluations
+    config = DEFAULT_EVALUATOR.config()
 
     for d in range(1, 8):
-        results[d] = {}
         print(f'Running regular game with a depth of {d}')
 
         # Initialize model and controllers
@@ -33,10 +31,8 @@ def main():
                 break
 
         # Save results
-        results[d]['regular_count'] = p1.total_calls + p2.total_calls
-        results[d]['regular_winner'] = board.check_win()
-        results[d]['regular_turns'] = board.turn_count
-        results[d]['regular_board'] = int(board)
+        store.append('minimax', d, run, p1.total_calls + p2.total_calls, board.check_win(), board.turn_count,
+                     int(board), config=config)
 
         print(f'Running a AB game with a depth of {d}')
         # Re-init for AB version
@@ -54,13 +50,10 @@ def main():
                 break
 
         # Save results
-        results[d]['ab_count'] = p1.total_calls + p2.total_calls
-        results[d]['ab_winner'] = board.check_win()
-        results[d]['ab_turns'] = board.turn_count
-        results[d]['ab_board'] = int(board)
+        store.append('minimaxab', d, run, p1.total_calls + p2.total_calls, board.check_win(), board.turn_count,
+                     int(board), config=config)
 
-    with open(filepath, 'w') as file:
-        json.dump(results, file)
+    store.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,185 @@
+"""
+Module that implements Monte Carlo Tree Search with batched random rollouts
+"""
+
+import math
+import time
+import numpy as np
+from typing import *
+from model import ConnectFour, BatchConnectFour, board_winners
+
+
+class Node:
+    """
+    Class to represent one gamestate in the search tree
+
+    Attributes:
+        gamestate: the ConnectFour state this node represents
+        parent: the Node this node was expanded from, or None if this is the root
+        children: a list of Nodes, each index corresponding to placing a token in the corresponding column, or None
+            if that move has not been expanded
+        untried: a list of ints, the legal columns that have not been expanded yet
+        winner: an int, 1 if P1 has won in this state, -1 if P2 has, or 0 otherwise
+        terminal: a bool, whether the game is over in this state
+        visits: an int, the number of playouts through this node
+        value: a float, the total reward of those playouts for the player who moved into this node
+    """
+    def __init__(self, gamestate: ConnectFour, parent: Optional['Node'] = None):
+        self.gamestate = gamestate
+        self.parent = parent
+        self.children: List[Optional[Node]] = [None for _ in range(gamestate.board.shape[1])]
+        # The window lookup is the same check as ConnectFour.check_win, without a convolution per node
+        self.winner = int(board_winners(gamestate.board[np.newaxis])[0])
+        self.terminal = self.winner != 0 or gamestate.turn_count >= gamestate.board.size
+        self.untried = [] if self.terminal else [col for col in range(gamestate.board.shape[1])
+                                                 if gamestate.board[0, col] == 0]
+        self.visits = 0
+        self.value = 0.0
+
+    def expand(self) -> 'Node':
+        """
+        Adds a child for one of the untried moves
+
+        :return: the new child Node
+        """
+        column = self.untried.pop()
+        self.children[column] = Node(self.gamestate.create_child(column), self)
+        return self.children[column]
+
+    def select(self, exploration: float) -> 'Node':
+        """
+        Picks the child with the highest upper confidence bound (UCT)
+
+        :param exploration: a float, how heavily to weigh rarely visited children
+        :return: the chosen child Node
+        """
+        log_visits = math.log(self.visits)
+        return max((c for c in self.children if c is not None),
+                   key=lambda c: c.value / c.visits + exploration * math.sqrt(log_visits / c.visits))
+
+    def add_virtual_loss(self):
+        """
+        Counts a pending playout through this node and its ancestors as a loss, so that the other selections in the
+        same batch are steered towards different leaves
+        """
+        node = self
+        while node is not None:
+            node.visits += 1
+            node = node.parent
+
+    def backpropagate(self, red_reward: float, count: int, pending: int = 0):
+        """
+        Adds the results of a batch of playouts to this node and all of its ancestors
+
+        :param red_reward: a float, the total reward of the playouts for P1 (1 per win, 0.5 per draw)
+        :param count: an int, the number of playouts
+        :param pending: an int, how many of those playouts were already counted by add_virtual_loss
+        """
+        node = self
+        while node is not None:
+            node.visits += count - pending
+            # The player who moved into the node is the one not about to move
+            node.value += count - red_reward if node.gamestate.is_red else red_reward
+            node = node.parent
+
+    def find(self, gamestate: ConnectFour) -> Optional['Node']:
+        """
+        Finds the expanded node below this one with the same board as the given gamestate
+
+        :param gamestate: the ConnectFour state to search for
+        :return: the matching Node, or None if that state has not been expanded
+        """
+        node = self
+        while node.gamestate.turn_count < gamestate.turn_count:
+            # Tokens never move, so the next node on the path agrees with every token already on its board
+            node = next((c for c in node.children if c is not None and
+                         np.all((c.gamestate.board == 0) | (c.gamestate.board == gamestate.board))), None)
+            if node is None:
+                return None
+        return node if np.array_equal(node.gamestate.board, gamestate.board) else None
+
+
+# The number of leaves in the first batch of a time-limited search, before its throughput has been measured
+FIRST_BATCH_SIZE = 8
+
+
+def rollout(gamestates: Sequence[ConnectFour], rng: np.random.Generator, deadline: Optional[float] = None)\
+        -> np.ndarray:
+    """
+    Plays one random game to completion from each of the given states, all at once
+
+    :param gamestates: a sequence of the ConnectFour states to start from
+    :param rng: the numpy Generator to draw moves from
+    :param deadline: a float, the time.perf_counter() value to stop at, scoring unfinished games as draws, or None
+        to play every game to the end
+    :return: an ndarray of ints, 1 where P1 won, -1 where P2 won, and 0 for a draw, for each state
+    """
+    return BatchConnectFour.from_games(gamestates).play_random(rng, deadline)
+
+
+def mcts(root: Node, time_limit: Optional[float] = None, playouts: Optional[int] = None, batch_size: int = 64,
+         exploration: float = math.sqrt(2), rng: Optional[np.random.Generator] = None) -> Tuple[int, int]:
+    """
+    Performs Monte Carlo Tree Search from the given node, growing its tree in place
+
+    :param root: the Node to search from
+    :param time_limit: a float, the number of seconds to search for, or None for no time limit
+    :param playouts: an int, the number of playouts to perform, or None for no playout limit
+    :param batch_size: an int, the most leaves to select and play out at once (fewer when time is short)
+    :param exploration: a float, the UCT exploration constant
+    :param rng: the numpy Generator to draw rollout moves from, or None to create a new one
+    :return: a tuple of ints containing the column with the most visits and the number of playouts performed
+    :raises: ValueError if neither a time limit nor a playout limit is given, either limit or the batch size is not
+        positive, or the root is terminal
+    """
+    if time_limit is None and playouts is None:
+        raise ValueError('Expected a time limit or playout limit, received neither.')
+    if time_limit is not None and time_limit <= 0:
+        raise ValueError(f'Time limit must be positive, received {time_limit}.')
+    if playouts is not None and playouts < 1:
+        raise ValueError(f'Playout limit must be at least 1, received {playouts}.')
+    if batch_size < 1:
+        raise ValueError(f'Batch size must be at least 1, received {batch_size}.')
+    if root.terminal:
+        raise ValueError('Cannot search from a finished game.')
+    rng = np.random.default_rng() if rng is None else rng
+
+    end = None if time_limit is None else time.perf_counter() + time_limit
+    total = 0
+    # Leaves searched per second, measured from the previous batch, used to keep batches within the time limit
+    rate = None
+    # Always search at least once so there is a move to return
+    while total == 0 or ((playouts is None or total < playouts) and (end is None or time.perf_counter() < end)):
+        count = batch_size if playouts is None else min(batch_size, playouts - total)
+        if end is not None:
+            count = min(count, FIRST_BATCH_SIZE if rate is None else max(1, int(rate * (end - time.perf_counter()))))
+        start = time.perf_counter()
+        leaves = []
+        for _ in range(count):
+            # Once out of time, only play out the leaves selected so far
+            if leaves and end is not None and time.perf_counter() >= end:
+                break
+
+            # Select down to a node with moves left to try
+            node = root
+            while not node.untried and not node.terminal:
+                node = node.select(exploration)
+
+            # Expand one new move
+            if not node.terminal:
+                node = node.expand()
+            node.add_virtual_loss()
+            leaves.append(node)
+
+        # Simulate every unfinished leaf in one batch, scoring finished games directly. A single batch takes a few
+        # milliseconds however small it is, so rollouts still running at the time limit are cut short
+        unfinished = [leaf for leaf in leaves if not leaf.terminal]
+        results = iter(rollout([leaf.gamestate for leaf in unfinished], rng, end))
+        for leaf in leaves:
+            winner = leaf.winner if leaf.terminal else next(results)
+            leaf.backpropagate((winner + 1) / 2, 1, pending=1)
+        total += len(leaves)
+        rate = len(leaves) / max(time.perf_counter() - start, 1e-9)
+
+    column = max((i for i, c in enumerate(root.children) if c is not None), key=lambda i: root.children[i].visits)
+    return column, total
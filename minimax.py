@@ -2,9 +2,8 @@
 Module that implements the Minimax algorithm
 """
 
-from model import ConnectFour, WIN_KERNELS
-from scipy import signal
-import numpy as np
+from model import ConnectFour
+from evaluation import Evaluator, static_eval
 from typing import *
 import networkx as nx
 import matplotlib.pyplot as plt
@@ -83,7 +82,8 @@ class Tree:
         return self.children[item]
 
 
-def minimax(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: bool = False) -> Tuple[int, int]:
+def minimax(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: bool = False,
+            evaluator: Optional[Evaluator] = None) -> Tuple[int, int]:
     """
     Performs the minimax algorithm on the current gamestate
 
@@ -91,17 +91,18 @@ def minimax(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: bool
     :param gamestate: an instance of ConnectFour
     :param maximize: a bool representing the maximizing (True) or minimizing (False) player.
     :param make_tree: a bool, whether to create and display the minimax Tree
+    :param evaluator: the Evaluator used to score leaves, or None to use the default weights
     :return: The optimal column to play according to minimax
     """
     tree = Tree(gamestate) if make_tree else None
-    _, column, calls = _minimax(depth, gamestate, None, maximize, tree)
+    _, column, calls = _minimax(depth, gamestate, None, maximize, tree, evaluator)
     if make_tree:
         tree.display()
     return column, calls
 
 
-def minimaxab(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: bool = False)\
-        -> Tuple[int, int]:
+def minimaxab(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: bool = False,
+              evaluator: Optional[Evaluator] = None) -> Tuple[int, int]:
     """
     Performs the minimax algorithm on a given gamestate, with Alpha-Beta pruning
 
@@ -109,17 +110,18 @@ def minimaxab(depth: int, gamestate: ConnectFour, maximize: bool, make_tree: boo
     :param gamestate: an instance of ConnectFour
     :param maximize: a bool representing the maximizing (True) or minimizing (False) player.
     :param make_tree: a bool, whether to create and display the minimax Tree
+    :param evaluator: the Evaluator used to score leaves, or None to use the default weights
     :return: The optimal column to play according to minimax with AB pruning
     """
     tree = Tree(gamestate) if make_tree else None
-    _, column, calls = _minimax(depth, gamestate, (int(-1e12), int(1e12)), maximize, tree)
+    _, column, calls = _minimax(depth, gamestate, (int(-1e12), int(1e12)), maximize, tree, evaluator)
     if make_tree:
         tree.display()
     return column, calls
 
 
-def _minimax(depth: int, gamestate: ConnectFour, ab: Optional[Tuple[int, int]], maximize: bool, tree: Optional[Tree])\
-        -> Tuple[int, int, int]:
+def _minimax(depth: int, gamestate: ConnectFour, ab: Optional[Tuple[int, int]], maximize: bool, tree: Optional[Tree],
+             evaluator: Optional[Evaluator] = None) -> Tuple[int, int, int]:
     """
     Performs the minimax algorithm on a given gamestate, with Alpha-Beta pruning
 
@@ -128,11 +130,12 @@ def _minimax(depth: int, gamestate: ConnectFour, ab: Optional[Tuple[int, int]],
     :param ab: a tuple containing the alpha and beta parameters for AB pruning, or None to perform regular minimax
     :param maximize: a bool representing the maximizing (True) or minimizing (False) player.
     :param tree: the Tree of the given gamestate, or None to not create a Tree
+    :param evaluator: the Evaluator used to score leaves, or None to use the default weights
     :return: A tuple of ints containing the score, the column to get that score, and the number of calls.
     """
     # Base case - reached minimum depth or someone has won
     if depth == 0 or gamestate.check_win() != 0:
-        score = static_eval(gamestate)
+        score = static_eval(gamestate, evaluator)
         if tree is not None:
             tree.score = score
         return score, -1, 1
@@ -147,7 +150,8 @@ def _minimax(depth: int, gamestate: ConnectFour, ab: Optional[Tuple[int, int]],
         if child is not None:
             if tree is not None:
                 tree[i] = Tree(child)
-            score, _, calls = _minimax(depth - 1, child, ab, not maximize, None if tree is None else tree[i])
+            score, _, calls = _minimax(depth - 1, child, ab, not maximize, None if tree is None else tree[i],
+                                       evaluator)
             total_calls += calls
             # If the score is less or we are trying to maximize (but not both) then found new good score
             # Or if best[1] is -1, then this is our first run and we need to set it
@@ -167,31 +171,3 @@ def _minimax(depth: int, gamestate: ConnectFour, ab: Optional[Tuple[int, int]],
     if tree is not None:
         tree.score = best[0]
     return best[0], best[1], total_calls
-
-
-# The kernels used to detect potential three-in-a-row
-TRIPLE_KERNELS = [np.eye(3, dtype=int),
-                  np.flip(np.eye(3, dtype=int), 1),
-                  np.ones((3, 1), dtype=int),
-                  np.ones((1, 3), dtype=int)]
-
-
-def static_eval(gamestate: ConnectFour) -> int:
-    """
-    Calculates a score for the current game state
-
-    :param gamestate: an instance of ConnectFour to evaluate
-    :return: an int, the score for the state
-    """
-    total = 0
-    for kernel in WIN_KERNELS:
-        convolution = signal.convolve2d(gamestate.board, kernel, mode='valid')
-        total += np.sum(convolution == 4) * 100000000000
-        total += np.sum(convolution == 3) * 10
-        total += np.sum(convolution == -4) * -100000000000
-        total += np.sum(convolution == -3) * -10
-    for kernel in TRIPLE_KERNELS:
-        convolution = signal.convolve2d(gamestate.board, kernel, mode='valid')
-        total += np.sum(convolution == 2) * 1
-        total += np.sum(convolution == -2) * -1
-    return total
@@ -2,6 +2,7 @@
 Module to hold the model of the ConnectFour game
 """
 
+import time
 import numpy as np
 from scipy import signal
 from typing import *
@@ -14,6 +15,29 @@ WIN_KERNELS = [np.eye(4, dtype=int),
                np.ones((1, 4), dtype=int)]
 
 
+def _make_win_windows(rows: int = 6, cols: int = 7) -> np.ndarray:
+    """
+    Lists every line of four cells on the board that would win the game
+
+    :param rows: an int, the number of rows on the board
+    :param cols: an int, the number of columns on the board
+    :return: an Nx4 ndarray of ints, each row holding the flat (row-major) board indices of one winning window
+    """
+    windows = []
+    for row in range(rows):
+        for col in range(cols):
+            # Right, down, down-right, and down-left
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + 3 * d_row, col + 3 * d_col
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append([(row + i * d_row) * cols + col + i * d_col for i in range(4)])
+    return np.array(windows, dtype=int)
+
+
+# The flat board indices of all 69 winning windows, used to index a flattened board
+WIN_WINDOWS = _make_win_windows()
+
+
 class ConnectFour:
     """
     Internal model of the Connect Four game, storing board state, player turn, and turn count
@@ -141,3 +165,163 @@ class ConnectFour:
         :return: an integer representation of this board, equivalent to __hash__
         """
         return hash(self)
+
+
+class BatchConnectFour:
+    """
+    Many Connect Four games stored side by side in ndarrays, so that moves and win checks for every game happen in
+    single vectorized operations
+
+    Attributes:
+        boards: an Nx6x7 ndarray of 0, 1, and -1, the board of each game, laid out as in ConnectFour
+        is_red: a length N ndarray of bools, whether the next player to play in each game should be P1
+        turn_count: a length N ndarray of ints, the number of elapsed turns in each game
+        heights: an Nx7 ndarray of ints, the number of tokens in each column of each game
+    """
+    def __init__(self, size: int):
+        """
+        Initialize a batch of Connect Four games from the beginning
+
+        :param size: an int, the number of games in the batch
+        """
+        self.boards = np.zeros((size, 6, 7), dtype=np.int8)
+        self.is_red = np.ones(size, dtype=bool)
+        self.turn_count = np.zeros(size, dtype=int)
+        self.heights = np.zeros((size, 7), dtype=int)
+
+    @classmethod
+    def from_game(cls, game: ConnectFour, size: int) -> 'BatchConnectFour':
+        """
+        Create a batch where every game starts as a copy of the given game
+
+        :param game: the ConnectFour state to copy
+        :param size: an int, the number of games in the batch
+        :return: a BatchConnectFour of size copies of game
+        """
+        batch = cls(size)
+        batch.boards[:] = game.board
+        batch.is_red[:] = game.is_red
+        batch.turn_count[:] = game.turn_count
+        batch.heights[:] = np.count_nonzero(game.board, axis=0)
+        return batch
+
+    @classmethod
+    def from_games(cls, games: Sequence[ConnectFour]) -> 'BatchConnectFour':
+        """
+        Create a batch holding a copy of each of the given games
+
+        :param games: a sequence of the ConnectFour states to copy
+        :return: a BatchConnectFour with one game per state, in the same order
+        """
+        batch = cls(len(games))
+        for i, game in enumerate(games):
+            batch.boards[i] = game.board
+            batch.is_red[i] = game.is_red
+            batch.turn_count[i] = game.turn_count
+        batch.heights[:] = np.count_nonzero(batch.boards, axis=1)
+        return batch
+
+    def __len__(self) -> int:
+        """
+        :return: an int, the number of games in the batch
+        """
+        return self.boards.shape[0]
+
+    def game(self, index: int) -> ConnectFour:
+        """
+        Create a standalone copy of one game in the batch
+
+        :param index: an int, the index of the game to copy
+        :return: a ConnectFour with the same state as the game at index
+        """
+        game = ConnectFour()
+        game.board = self.boards[index].astype(int)
+        game.is_red = bool(self.is_red[index])
+        game.turn_count = int(self.turn_count[index])
+        return game
+
+    def legal_moves(self) -> np.ndarray:
+        """
+        :return: an Nx7 ndarray of bools, whether each column of each game has room for another token
+        """
+        return self.heights < self.boards.shape[1]
+
+    def place_tokens(self, columns: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Performs one turn in every game by placing a token in the given column of each
+
+        :param columns: a length N ndarray of ints between 0 and 6, the column to play in each game
+        :param mask: a length N ndarray of bools, which games to play in, or None to play in all of them
+        :return: a length N ndarray of bools, whether a token was placed in each game (False if the game was masked
+            out or the column was full)
+        :raises: ValueError if a given column is out of bounds
+        """
+        columns = np.asarray(columns)
+        if mask is None:
+            mask = np.ones(len(self), dtype=bool)
+        if np.any((columns[mask] < 0) | (columns[mask] > 6)):
+            raise ValueError(f'Column out of bounds. Expected between 0 and 6 (inclusive), received '
+                             f'{columns[mask][(columns[mask] < 0) | (columns[mask] > 6)]}.')
+
+        # Only games that are playing and have room in their chosen column get a token
+        games = np.arange(len(self))
+        valid = mask.copy()
+        valid[mask] = self.heights[games[mask], columns[mask]] < self.boards.shape[1]
+        games, columns = games[valid], columns[valid]
+
+        # The board is stored top row first, so the new top is counted up from the bottom row
+        rows = self.boards.shape[1] - 1 - self.heights[games, columns]
+        self.boards[games, rows, columns] = np.where(self.is_red[games], 1, -1)
+
+        # Update tracking variables
+        self.heights[games, columns] += 1
+        self.is_red[games] = ~self.is_red[games]
+        self.turn_count[games] += 1
+        return valid
+
+    def check_wins(self) -> np.ndarray:
+        """
+        Finds which player, if any, has won each game
+
+        :return: a length N ndarray of ints, 1 where P1 won, -1 where P2 won, and 0 where there is no winner yet
+        """
+        return board_winners(self.boards)
+
+    def random_moves(self, rng: np.random.Generator) -> np.ndarray:
+        """
+        Picks a uniformly random legal column in every game
+
+        :param rng: the numpy Generator to draw from
+        :return: a length N ndarray of ints, a legal column for each game (or a full column if the board is full)
+        """
+        return np.argmax(rng.random(self.heights.shape) * self.legal_moves(), axis=1)
+
+    def play_random(self, rng: np.random.Generator, deadline: Optional[float] = None) -> np.ndarray:
+        """
+        Plays random legal moves in every game until each one is won or the board fills
+
+        :param rng: the numpy Generator to draw moves from
+        :param deadline: a float, the time.perf_counter() value to stop playing at, leaving unfinished games with no
+            winner, or None to play every game to the end
+        :return: a length N ndarray of ints, 1 where P1 won, -1 where P2 won, and 0 for a draw (or unfinished game)
+        """
+        cells = self.boards.shape[1] * self.boards.shape[2]
+        winners = self.check_wins()
+        active = (winners == 0) & (self.turn_count < cells)
+        while np.any(active) and (deadline is None or time.perf_counter() < deadline):
+            self.place_tokens(self.random_moves(rng), active)
+            # Only the games that just moved can have a new winner
+            winners[active] = board_winners(self.boards[active])
+            active &= (winners == 0) & (self.turn_count < cells)
+        return winners
+
+
+def board_winners(boards: np.ndarray) -> np.ndarray:
+    """
+    Finds which player, if any, has won each of a stack of boards
+
+    :param boards: an Nx6x7 ndarray of 0, 1, and -1
+    :return: a length N ndarray of ints, 1 where P1 won, -1 where P2 won, and 0 where there is no winner yet
+    """
+    sums = boards.reshape(boards.shape[0], boards.shape[1] * boards.shape[2])[:, WIN_WINDOWS].sum(axis=2)
+    return np.where(np.any(sums == 4, axis=1), 1, np.where(np.any(sums == -4, axis=1), -1, 0))
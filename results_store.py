@@ -0,0 +1,195 @@
+"""
+Module to hold the append-only store of game results
+"""
+import datetime
+import json
+import os
+import sqlite3
+import uuid
+from typing import *
+
+
+# The columns of each result, in storage order
+COLUMNS = ('engine', 'config', 'depth', 'date', 'run', 'calls', 'winner', 'turns', 'board')
+
+# The columns results can be looked up by, each backed by an index
+KEY_COLUMNS = ('engine', 'config', 'depth', 'date', 'run')
+
+# The config of results imported from game_results.json, which were played with the old convolution evaluation
+LEGACY_CONFIG = {'evaluation': 'convolution', 'win': 100000000000, 'three': 10, 'two': 1}
+
+# The date given to results imported from game_results.json. The file does not record when its games were played, and
+# its modification time only reflects when it was checked out, so this fixed date (earlier than any real one) is used
+LEGACY_DATE = '0001-01-01'
+
+# The default location of the store, next to this module
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_results.db')
+
+
+def new_run_id() -> str:
+    """
+    :return: a string, an identifier for a new run that will not collide with runs made in parallel
+    """
+    return uuid.uuid4().hex
+
+
+class ResultsStore:
+    """
+    An append-only store of game results, backed by SQLite so that parallel runs can write to it at once
+
+    Each result is one game played by one engine configuration. Results are never updated or removed.
+    """
+    def __init__(self, filepath: str = DEFAULT_PATH, timeout: float = 30.0):
+        """
+        Opens the store, creating it if it does not exist
+
+        :param filepath: a string, the path to the database file
+        :param timeout: a float, the number of seconds to wait for another writer to finish
+        """
+        self._connection = sqlite3.connect(filepath, timeout=timeout)
+        # Write-ahead logging lets readers stream while other processes append
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                                     'engine TEXT NOT NULL, config TEXT NOT NULL, depth INTEGER, '
+                                     'date TEXT NOT NULL, run TEXT NOT NULL, calls INTEGER, winner INTEGER, '
+                                     'turns INTEGER, board INTEGER)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS results_engine_depth ON results (engine, depth)')
+            for column in ('config', 'date', 'run'):
+                self._connection.execute(f'CREATE INDEX IF NOT EXISTS results_{column} ON results ({column})')
+
+    def append(self, engine: str, depth: Optional[int], run: str, calls: int, winner: int, turns: int, board: int,
+               config: Optional[Dict[str, Any]] = None, date: Optional[str] = None):
+        """
+        Adds the result of one game to the store
+
+        :param engine: a string, the name of the engine, such as 'minimax' or 'minimaxab'
+        :param depth: an int, the search depth of the engine, or None if it does not search to a fixed depth
+        :param run: a string, the identifier of the run this game belongs to
+        :param calls: an int, the number of calls (or playouts) the engine made over the game
+        :param winner: an int, 1 if P1 won, -1 if P2 won, or 0 for a draw
+        :param turns: an int, the number of turns in the game
+        :param board: an int, the integer representation of the final board
+        :param config: a dict of any other settings of the engine, or None if there are none
+        :param date: a string, the ISO format date the game was played, or None to use today
+        """
+        with self._connection:
+            self._connection.execute(_INSERT, _make_row(engine, depth, run, calls, winner, turns, board, config, date))
+
+    def append_run(self, run: str, results: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Adds the results of a whole run in one transaction, so either all of them are stored or none are
+
+        :param run: a string, the identifier of the run
+        :param results: an iterable of dicts, each holding the arguments of append (other than run) for one game
+        :return: a bool, whether the results were added (False if the store already had results for the run)
+        """
+        rows = [_make_row(run=run, **result) for result in results]
+        with self._connection:
+            # Take the write lock before checking, so two writers cannot both add the same run
+            self._connection.execute('BEGIN IMMEDIATE')
+            if self._connection.execute('SELECT 1 FROM results WHERE run = ? LIMIT 1', (run,)).fetchone():
+                return False
+            self._connection.executemany(_INSERT, rows)
+        return True
+
+    def query(self, columns: Sequence[str] = COLUMNS, **keys) -> Iterator[tuple]:
+        """
+        Streams the results matching the given keys, in the order they were added
+
+        :param columns: a sequence of strings from COLUMNS, the columns to return for each result
+        :param keys: values to match for any of the columns in KEY_COLUMNS, such as engine='minimaxab', depth=6
+        :return: an Iterator of tuples, the requested columns of each matching result
+        :raises: ValueError if an unknown column or key is given
+        """
+        unknown = (set(columns) - set(COLUMNS)) | (set(keys) - set(KEY_COLUMNS))
+        if unknown:
+            raise ValueError(f'Unknown columns {sorted(unknown)}. Expected some of {list(COLUMNS)}.')
+        if 'config' in keys:
+            keys['config'] = _encode_config(keys['config'])
+
+        # NULL never equals anything, so None keys (such as the depth of MCTS results) are matched with IS NULL
+        where = ' AND '.join(f'{key} IS NULL' if value is None else f'{key} = ?' for key, value in keys.items()) or '1'
+        return self._connection.execute(f'SELECT {", ".join(columns)} FROM results WHERE {where} ORDER BY id',
+                                        tuple(value for value in keys.values() if value is not None))
+
+    def close(self):
+        """
+        Closes the connection to the store
+        """
+        self._connection.close()
+
+    def __enter__(self) -> 'ResultsStore':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# The statement that adds one result, taking the values of COLUMNS in order
+_INSERT = f'INSERT INTO results ({", ".join(COLUMNS)}) VALUES ({", ".join("?" for _ in COLUMNS)})'
+
+
+def _make_row(engine: str, depth: Optional[int], run: str, calls: int, winner: int, turns: int, board: int,
+              config: Optional[Dict[str, Any]] = None, date: Optional[str] = None) -> tuple:
+    """
+    :return: a tuple, the values of COLUMNS for one result, taking the same arguments as ResultsStore.append
+    """
+    date = datetime.date.today().isoformat() if date is None else date
+    return engine, _encode_config(config), depth, date, run, calls, winner, turns, board
+
+
+def _encode_config(config: Optional[Dict[str, Any]]) -> str:
+    """
+    :param config: a dict of engine settings, or None
+    :return: a string, the canonical JSON encoding of the settings, so equal settings compare equal
+    """
+    return json.dumps({} if config is None else config, sort_keys=True)
+
+
+def import_legacy_json(store: ResultsStore, filepath: str):
+    """
+    Copies the results from a game_results.json file written by the old graph_results.py into the store
+
+    The old script mixed int and str keys, so the file can hold each depth more than once. Each occurrence of a depth
+    is imported as its own run, named 'legacy-1', 'legacy-2', and so on, dated LEGACY_DATE. Each run is added in one
+    transaction and runs already in the store are skipped, so importing the same file again adds nothing, and an
+    interrupted import can simply be rerun.
+
+    :param store: the ResultsStore to add the results to
+    :param filepath: a string, the path to the JSON file
+    """
+    with open(filepath, 'r') as file:
+        # Keep every key/value pair, as a dict would only keep the last copy of each depth
+        pairs = json.load(file, object_pairs_hook=list)
+
+    # The nth occurrence of a depth belongs to the nth run
+    runs: List[List[Tuple[int, Dict[str, int]]]] = []
+    seen: Dict[str, int] = {}
+    for depth, result in pairs:
+        occurrence = seen.get(depth, 0)
+        seen[depth] = occurrence + 1
+        if occurrence == len(runs):
+            runs.append([])
+        runs[occurrence].append((int(depth), dict(result)))
+
+    for i, results in enumerate(runs):
+        store.append_run(f'legacy-{i + 1}', [
+            {'engine': engine, 'depth': depth, 'calls': result[f'{prefix}_count'], 'winner': result[f'{prefix}_winner'],
+             'turns': result[f'{prefix}_turns'], 'board': result[f'{prefix}_board'], 'config': LEGACY_CONFIG,
+             'date': LEGACY_DATE}
+            for depth, result in results
+            for engine, prefix in (('minimax', 'regular'), ('minimaxab', 'ab'))])
+
+
+def main():
+    """
+    Import the results in game_results.json into the store
+    """
+    filepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_results.json')
+    with ResultsStore() as store:
+        import_legacy_json(store, filepath)
+
+
+if __name__ == '__main__':
+    main()
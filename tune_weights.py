@@ -0,0 +1,91 @@
+"""
+Run weight-tuning matches in bulk, pitting candidate evaluation weights against a baseline
+"""
+import argparse
+import itertools
+import json
+from multiprocessing import Pool
+from typing import *
+
+from model import ConnectFour
+from controller import MinimaxABController
+from evaluation import Evaluator, DEFAULT_WEIGHTS
+
+
+def play_match(candidate: Dict[str, int], baseline: Dict[str, int], opening: Tuple[int, ...], candidate_red: bool,
+               depth: int) -> int:
+    """
+    Plays one game between two sets of weights from a fixed opening
+
+    :param candidate: a dict, the weights of the candidate evaluator
+    :param baseline: a dict, the weights of the baseline evaluator
+    :param opening: a tuple of ints, the columns played before the engines take over
+    :param candidate_red: a bool, whether the candidate plays P1
+    :param depth: an int, the search depth of both engines
+    :return: 1 if the candidate won, -1 if the baseline won, or 0 for a draw
+    """
+    board = ConnectFour()
+    for col in opening:
+        board.place_token(col)
+    candidate_player = MinimaxABController(board, candidate_red, depth, Evaluator(candidate))
+    baseline_player = MinimaxABController(board, not candidate_red, depth, Evaluator(baseline))
+    players = {candidate_red: candidate_player, not candidate_red: baseline_player}
+
+    # Play until someone wins or the board fills
+    while board.turn_count < 42 and board.check_win() == 0:
+        players[board.is_red].move()
+
+    winner = board.check_win()
+    return winner if candidate_red else -winner
+
+
+def run_matches(candidate: Dict[str, int], baseline: Dict[str, int], depth: int, opening_length: int = 2,
+                processes: Optional[int] = None) -> Dict[str, int]:
+    """
+    Plays the candidate against the baseline from every opening of the given length, once as each color
+
+    :param candidate: a dict, the weights of the candidate evaluator
+    :param baseline: a dict, the weights of the baseline evaluator
+    :param depth: an int, the search depth of both engines
+    :param opening_length: an int, the number of moves in each opening
+    :param processes: an int, the number of worker processes, or None to use one per CPU
+    :return: a dict with the number of 'wins', 'losses', and 'draws' for the candidate
+    """
+    games = [(candidate, baseline, opening, red, depth)
+             for opening in itertools.product(range(7), repeat=opening_length)
+             for red in (True, False)]
+    with Pool(processes) as pool:
+        outcomes = pool.starmap(play_match, games)
+    return {'wins': outcomes.count(1), 'losses': outcomes.count(-1), 'draws': outcomes.count(0)}
+
+
+def main():
+    """
+    Score each candidate weight file against the baseline weights
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('candidates', nargs='+', help='JSON files of weights to evaluate')
+    parser.add_argument('--baseline', help='JSON file of baseline weights (default: the built-in weights)')
+    parser.add_argument('--depth', type=int, default=4, help='search depth of both engines')
+    parser.add_argument('--opening-length', type=int, default=2, help='number of moves in each opening')
+    parser.add_argument('--processes', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    baseline = Evaluator.from_file(args.baseline).weights if args.baseline else dict(DEFAULT_WEIGHTS)
+    results = {}
+    for filepath in args.candidates:
+        candidate = Evaluator.from_file(filepath).weights
+        print(f'Running {filepath} against the baseline at a depth of {args.depth}')
+        results[filepath] = run_matches(candidate, baseline, args.depth, args.opening_length, args.processes)
+        results[filepath]['weights'] = candidate
+        print(f'{filepath}: {results[filepath]["wins"]} wins, {results[filepath]["losses"]} losses, '
+              f'{results[filepath]["draws"]} draws')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file)
+
+
+if __name__ == '__main__':
+    main()
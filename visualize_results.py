@@ -1,21 +1,56 @@
 """
 Script to visualize the results of A/B pruning
 """
-import json
 import numpy as np
 from matplotlib import pyplot as plt
 from typing import *
+from results_store import ResultsStore
 
 
-def get_data(results: Dict[str, Dict[str, int]], key: str) -> np.ndarray:
+# The columns of the results used in the plots
+DATA_COLUMNS = ('calls', 'winner', 'turns', 'board')
+
+
+def latest_run(store: ResultsStore) -> Optional[str]:
+    """
+    Finds the most recent run that has results for both minimax and minimaxab
+
+    Results are only compared within a run, so both engines were played with the same evaluation.
+
+    :param store: the ResultsStore to read from
+    :return: a string, the identifier of the run, or None if no run has both engines
+    """
+    ab_runs = {run for run, in store.query(('run',), engine='minimaxab')}
+    latest, latest_date = None, ''
+    # Results stream oldest first, so on equal dates later runs replace earlier ones
+    for run, date in store.query(('run', 'date'), engine='minimax'):
+        if run in ab_runs and date >= latest_date:
+            latest, latest_date = run, date
+    return latest
+
+
+def get_results(store: ResultsStore, run: str, engine: str) -> Dict[int, Tuple[int, ...]]:
+    """
+    Streams the results of one engine in one run from the store
+
+    :param store: the ResultsStore to read from
+    :param run: a string, the identifier of the run to pull results from
+    :param engine: a string, the engine to pull results for
+    :return: a dict mapping each depth to a tuple of the calls, winner, turns, and board of its result
+    """
+    return {depth: tuple(data) for depth, *data in store.query(('depth',) + DATA_COLUMNS, run=run, engine=engine)}
+
+
+def get_data(latest: Dict[int, Tuple[int, ...]], depths: np.ndarray, key: str) -> np.ndarray:
     """
     Pulls the data from the results into a ndarray
 
-    :param results: a dict of dicts, the data to pull from
-    :param key: a string, the key in the second layer of dictionaries to pull from
-    :return: an ndarray vector containing the values of the key for each dict
+    :param latest: a dict mapping depths to results, as returned by get_results
+    :param depths: an ndarray of ints, the depths to pull data for
+    :param key: a string from DATA_COLUMNS, the value to pull from each result
+    :return: an ndarray vector containing the values of the key for each depth
     """
-    return np.array([v[key] for v in results.values()])
+    return np.array([latest[d][DATA_COLUMNS.index(key)] for d in depths])
 
 
 def main():
@@ -23,24 +58,27 @@ def main():
     Plot the results of graph_results.py
     """
     # Get results
-    folder = '\\'.join(__file__.split('\\')[:-1])
-    print(__file__)
-    with open('game_results.json', 'r') as file:
-        results = json.load(file)
+    with ResultsStore() as store:
+        run = latest_run(store)
+        if run is None:
+            print('No run has results for both minimax and minimaxab. Run graph_results.py first.')
+            return
+        regular = get_results(store, run, 'minimax')
+        ab = get_results(store, run, 'minimaxab')
 
     # Pull the data
-    depths = np.array([int(d) for d in results])
-    reg_cnt = get_data(results, 'regular_count')
-    reg_turns = get_data(results, 'regular_turns')
+    depths = np.array(sorted(set(regular) & set(ab)))
+    reg_cnt = get_data(regular, depths, 'calls')
+    reg_turns = get_data(regular, depths, 'turns')
     reg_scaled = reg_cnt / reg_turns
-    ab_cnt = get_data(results, 'ab_count')
-    ab_turns = get_data(results, 'ab_turns')
+    ab_cnt = get_data(ab, depths, 'calls')
+    ab_turns = get_data(ab, depths, 'turns')
     ab_scaled = ab_cnt / ab_turns
 
     # See if AB pruning changed the outcomes
-    print(get_data(results, 'regular_board') == get_data(results, 'ab_board'))
-    print(get_data(results, 'regular_winner'))
-    print(get_data(results, 'ab_winner'))
+    print(get_data(regular, depths, 'board') == get_data(ab, depths, 'board'))
+    print(get_data(regular, depths, 'winner'))
+    print(get_data(ab, depths, 'winner'))
 
     # Plot linear scale
     plt.plot(depths, reg_scaled)